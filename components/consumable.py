@@ -8,10 +8,11 @@ import components.ai
 import components.inventory
 from components.base_component import BaseComponent
 from exceptions import Impossible
-from input_handlers import ActionOrHandler, AreaRangedAttackHandler, SingleRangedAttackHandler
+from input_handlers import ActionOrHandler
 
 if TYPE_CHECKING:
     from entity import Actor, Item
+    from input_handlers import AreaRangedAttackHandler, SingleRangedAttackHandler
 
 
 class Consumable(BaseComponent):
@@ -35,6 +36,9 @@ class ConfusionConsumable(Consumable):
         self.number_of_turns = number_of_turns
 
     def get_action(self, consumer: Actor) -> Optional[SingleRangedAttackHandler]:
+        # Imported on use so the targeting handlers stay lazily loaded.
+        from input_handlers.menus import SingleRangedAttackHandler
+
         self.engine.message_log.add_message("Select a target location.", color.needs_target)
         return SingleRangedAttackHandler(
             self.engine,
@@ -84,6 +88,8 @@ class FireBallDamageConsumable(Consumable):
         self.radius = radius
 
     def get_action(self, consumer: Actor) -> AreaRangedAttackHandler:
+        from input_handlers.menus import AreaRangedAttackHandler
+
         self.engine.message_log.add_message("Select a target location.", color.needs_target)
         return AreaRangedAttackHandler(
             self.engine,
@@ -20,6 +20,11 @@ class Engine:
     game_map: GameMap
     game_world: GameWorld
 
+    # Set when the game state changes in a way that needs a redraw; consumed
+    # by the event handlers' tick().  A class-level default keeps engines
+    # unpickled from older saves working.
+    dirty = True
+
     def __init__(self, player: Actor):
         self.message_log = MessageLog()
         self.mouse_location = (0, 0)
@@ -0,0 +1,549 @@
+from __future__ import annotations
+
+import os
+
+from typing import Iterable, Optional, Tuple, TYPE_CHECKING, Union
+import numpy as np
+import tcod
+from tcod import libtcodpy
+
+import actions
+from actions import Action, BumpAction, PickupAction, WaitAction
+import color
+import exceptions
+
+# Pre-bound so constructing the action costs one global load instead of a
+# module load plus an attribute lookup per keypress.
+_TakeStairsAction = actions.TakeStairsAction
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+MOVE_KEYS = {
+    # Arrow keys.
+    tcod.event.KeySym.UP: (0, -1),
+    tcod.event.KeySym.DOWN: (0, 1),
+    tcod.event.KeySym.LEFT: (-1, 0),
+    tcod.event.KeySym.RIGHT: (1, 0),
+    tcod.event.KeySym.HOME: (-1, -1),
+    tcod.event.KeySym.END: (-1, 1),
+    tcod.event.KeySym.PAGEUP: (1, -1),
+    tcod.event.KeySym.PAGEDOWN: (1, 1),
+    # Numpad keys.
+    tcod.event.KeySym.KP_1: (-1, 1),
+    tcod.event.KeySym.KP_2: (0, 1),
+    tcod.event.KeySym.KP_3: (1, 1),
+    tcod.event.KeySym.KP_4: (-1, 0),
+    tcod.event.KeySym.KP_6: (1, 0),
+    tcod.event.KeySym.KP_7: (-1, -1),
+    tcod.event.KeySym.KP_8: (0, -1),
+    tcod.event.KeySym.KP_9: (1, -1),
+    # Vi keys.
+    tcod.event.KeySym.h: (-1, 0),
+    tcod.event.KeySym.j: (0, 1),
+    tcod.event.KeySym.k: (0, -1),
+    tcod.event.KeySym.l: (1, 0),
+    tcod.event.KeySym.y: (-1, -1),
+    tcod.event.KeySym.u: (1, -1),
+    tcod.event.KeySym.b: (-1, 1),
+    tcod.event.KeySym.n: (1, 1),
+}
+
+WAIT_KEYS = frozenset({
+    tcod.event.KeySym.PERIOD,
+    tcod.event.KeySym.KP_5,
+    tcod.event.KeySym.CLEAR,
+})
+
+CONFIRM_KEYS = {
+    tcod.event.KeySym.RETURN,
+    tcod.event.KeySym.KP_ENTER,
+}
+
+# Dense lookup tables indexed by KeySym, replacing the double dict probe
+# (`key in MOVE_KEYS` then `MOVE_KEYS[key]`) with one index and a None check.
+# Non-printable KeySym values have bit 30 (SDL's scancode mask) set, placing
+# them far outside any practical table, so they are folded into the
+# 0x200-0x3FF range: scancodes stay below 0x200 and printable keys keep their
+# ASCII value, giving every key a unique index below _KEY_TABLE_SIZE.
+_SCANCODE_MASK = 1 << 30
+_KEY_TABLE_SIZE = 0x400
+
+
+def _build_key_table(keys: dict) -> Tuple:
+    table = [None] * _KEY_TABLE_SIZE
+    for key, value in keys.items():
+        sym = int(key)
+        if sym & _SCANCODE_MASK:
+            sym = (sym & 0x1FF) | 0x200
+        table[sym] = value
+    return tuple(table)
+
+
+_MOVE_TABLE = _build_key_table(MOVE_KEYS)
+
+
+def _build_mod_mult_table() -> Tuple[int, ...]:
+    """Precompute the cursor-speed multiplier for every modifier combination.
+
+    A cursor keypress then costs one table load instead of three
+    test-and-multiply branches.  The shift/ctrl/alt bits all sit in the low
+    12 bits of `event.mod`; lock-key bits above that are masked off.
+    """
+    table = [1] * 0x1000
+    for mod in range(0x1000):
+        mult = 1
+        if mod & (tcod.event.KMOD_LSHIFT | tcod.event.KMOD_RSHIFT):
+            mult *= 5
+        if mod & (tcod.event.KMOD_LCTRL | tcod.event.KMOD_RCTRL):
+            mult *= 10
+        if mod & (tcod.event.KMOD_LALT | tcod.event.KMOD_RALT):
+            mult *= 20
+        table[mod] = mult
+    return tuple(table)
+
+
+_MOD_MULT = _build_mod_mult_table()
+
+# Selection letters for inventory slots, precomputed so the render loop
+# avoids a chr call per item.
+_ITEM_KEYS = tuple(chr(97 + i) for i in range(27))
+
+# Keys ignored by AskUserEventHandler, built once rather than as a set
+# literal on every keypress.
+_MODIFIER_ONLY_KEYS = frozenset({
+    tcod.event.KeySym.LSHIFT,
+    tcod.event.KeySym.RSHIFT,
+    tcod.event.KeySym.LCTRL,
+    tcod.event.KeySym.RCTRL,
+    tcod.event.KeySym.LALT,
+    tcod.event.KeySym.RALT,
+})
+
+
+# The hot event classes, bound once for the exact-type checks in
+# handle_events below.
+_KEYDOWN = tcod.event.KeyDown
+_MOUSEMOTION = tcod.event.MouseMotion
+_QUIT = tcod.event.Quit
+
+
+ActionOrHandler = Union[Action, "BaseEventHandler"]
+
+
+class BaseEventHandler(tcod.event.EventDispatch[ActionOrHandler]):
+    # __slots__ are declared on every handler class; EventDispatch is already
+    # slotted, so handler instances carry no per-instance __dict__ at all.
+    __slots__ = ()
+
+    def handle_events(self, event: tcod.event.Event) -> BaseEventHandler:
+        """Handle an event and return the next active event handler."""
+        # Route the dominant event types straight to their methods; the
+        # generic EventDispatch lookup only handles the rest.
+        t = type(event)
+        if t is _KEYDOWN:
+            state = self.ev_keydown(event)
+        elif t is _MOUSEMOTION:
+            state = self.ev_mousemotion(event)
+        elif t is _QUIT:
+            state = self.ev_quit(event)
+        else:
+            state = self.dispatch(event)
+        if isinstance(state, BaseEventHandler):
+            return state
+        assert not isinstance(state, Action), f"{self!r} can not handle actions."
+        return self
+
+    def handle_events_batch(self, events: Iterable[tcod.event.Event]) -> BaseEventHandler:
+        """Handle a whole frame's worth of events and return the next active event handler.
+
+        The caller drains the event queue once per frame, so the SDL pump cost
+        is paid once for the entire batch instead of once per event.
+        """
+        handler: BaseEventHandler = self
+        for event in events:
+            handler = handler.handle_events(event)
+        return handler
+
+    def tick(self, events: Iterable[tcod.event.Event]) -> Tuple[BaseEventHandler, bool]:
+        """Handle a frame's events and report whether a redraw is needed."""
+        return self.handle_events_batch(events), True
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        raise NotImplementedError()
+
+    def ev_quit(self, event: tcod.event.Quit) -> Optional[Action]:
+        raise SystemExit()
+
+
+class PopupMessage(BaseEventHandler):
+    __slots__ = ("parent", "text", "_dim_cache")
+
+    def __init__(self, parent: BaseEventHandler, text: str):
+        self.parent = parent
+        self.text = text
+        self._dim_cache: Optional[np.ndarray] = None
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        # The parent cannot change while the popup is open — every event
+        # returns control to it — so render and dim it once, then replay the
+        # cached buffer instead of redrawing and re-dividing every channel of
+        # the whole console each frame.
+        if self._dim_cache is None or self._dim_cache.shape != console.rgb.shape:
+            self.parent.on_render(console)
+            rgb = console.rgb
+            # >> 3 matches //= 8 for unsigned channels and is the cheaper ufunc.
+            np.right_shift(rgb["fg"], 3, out=rgb["fg"])
+            np.right_shift(rgb["bg"], 3, out=rgb["bg"])
+            self._dim_cache = rgb.copy()
+        else:
+            np.copyto(console.rgb, self._dim_cache)
+
+        console.print(console.width // 2,
+                      console.height // 2,
+                      self.text,
+                      fg=color.white,
+                      bg=color.black,
+                      alignment=libtcodpy.CENTER,
+                      )
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[BaseEventHandler]:
+        return self.parent
+
+
+class EventHandler(BaseEventHandler):
+    """Base class for handlers that act on a game Engine.
+
+    The main loop is expected to run each frame in this order:
+    poll events -> handle actions -> update FOV -> render -> present.
+    Polling before rendering means an input is reflected in the very next
+    presented frame instead of lagging one frame behind.
+    """
+
+    __slots__ = ("engine",)
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def tick(self, events: Iterable[tcod.event.Event]) -> Tuple[BaseEventHandler, bool]:
+        """Handle a frame's events and report whether a redraw is needed.
+
+        Returns the next active handler and True when an action was performed,
+        the active handler changed, or the mouse cursor moved — letting the
+        main loop skip redundant redraws on idle frames.
+        """
+        engine = self.engine
+        mouse_location = engine.mouse_location
+        handler = self.handle_events_batch(events)
+        needs_render = (handler is not self
+                        or engine.dirty
+                        or engine.mouse_location != mouse_location)
+        engine.dirty = False
+        return handler, needs_render
+
+    def handle_events(self, event: tcod.event.Event) -> BaseEventHandler:
+        # Same fast-path routing as BaseEventHandler.handle_events.
+        t = type(event)
+        if t is _KEYDOWN:
+            action_or_state = self.ev_keydown(event)
+        elif t is _MOUSEMOTION:
+            action_or_state = self.ev_mousemotion(event)
+        elif t is _QUIT:
+            action_or_state = self.ev_quit(event)
+        else:
+            action_or_state = self.dispatch(event)
+        if isinstance(action_or_state, BaseEventHandler):
+            return action_or_state
+        if self.handle_action(action_or_state):
+            if not self.engine.player.is_alive:
+                return _get_gameover_handler(self.engine)
+            elif self.engine.player.level.requires_level_up:
+                return _get_levelup_handler(self.engine)
+            return _get_main_handler(self.engine)
+        return self
+
+    def handle_action(self, action: Optional[Action]) -> bool:
+
+        if action is None:
+            return False
+
+        try:
+            action.perform()
+        except exceptions.Impossible as exc:
+            self.engine.message_log.add_message(exc.args[0], color.impossible)
+            self.engine.dirty = True  # The new message still needs a redraw.
+            return False
+
+        self.engine.handle_enemy_turn()
+
+        self.engine.update_fov()
+        self.engine.dirty = True
+        return True
+
+    def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
+        if self.engine.game_map.in_bounds(event.tile.x, event.tile.y):
+            self.engine.mouse_location = event.tile.x, event.tile.y
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        self.engine.render(console)
+
+
+class MainGameEventHandler(EventHandler):
+    __slots__ = ()
+
+    def handle_events_batch(self, events: Iterable[tcod.event.Event]) -> BaseEventHandler:
+        """Handle a frame's events, dropping key-repeat duplicates of movement keys.
+
+        When the OS delivers a key-repeat storm in a single frame, only the
+        first press of a held movement key acts, so the player takes one turn
+        per frame instead of one per queued repeat.
+        """
+        handler: BaseEventHandler = self
+        last_move_sym: Optional[tcod.event.KeySym] = None
+        for event in events:
+            # Compare by type, not identity: a successful action swaps in the
+            # engine's cached MainGameEventHandler, which is a different
+            # object from a directly constructed one but the same state.
+            if type(handler) is MainGameEventHandler and isinstance(event, tcod.event.KeyDown):
+                sym = int(event.sym)
+                if sym & _SCANCODE_MASK:
+                    sym = (sym & 0x1FF) | 0x200
+                if sym < _KEY_TABLE_SIZE and _MOVE_TABLE[sym] is not None:
+                    if event.sym == last_move_sym:
+                        continue
+                    last_move_sym = event.sym
+                else:
+                    last_move_sym = None
+            handler = handler.handle_events(event)
+            if type(handler) is not MainGameEventHandler:
+                # Leaving the main-game state (menu, level up, game over)
+                # invalidates the held-key bookkeeping.
+                last_move_sym = None
+        return handler
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
+        fn = _MAIN_KEY_DISPATCH.get(event.sym)
+        return fn(self, event) if fn is not None else None
+
+
+def _get_main_handler(engine: Engine) -> MainGameEventHandler:
+    """Return the engine's cached MainGameEventHandler, creating it lazily.
+
+    Handlers are stateless beyond their engine reference, so one instance per
+    engine avoids allocating a fresh handler on every successful action.
+    """
+    handler = getattr(engine, "_main_handler", None)
+    if handler is None:
+        handler = engine._main_handler = MainGameEventHandler(engine)
+    return handler
+
+
+def _get_gameover_handler(engine: Engine) -> GameOverEventHandler:
+    """Return the engine's cached GameOverEventHandler, creating it lazily."""
+    handler = getattr(engine, "_gameover_handler", None)
+    if handler is None:
+        handler = engine._gameover_handler = GameOverEventHandler(engine)
+    return handler
+
+
+def _get_levelup_handler(engine: Engine):
+    """Return the engine's cached LevelUpEventHandler, creating it lazily."""
+    handler = getattr(engine, "_levelup_handler", None)
+    if handler is None:
+        from input_handlers.menus import LevelUpEventHandler
+
+        handler = engine._levelup_handler = LevelUpEventHandler(engine)
+    return handler
+
+
+class AskUserEventHandler(EventHandler):
+    __slots__ = ()
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
+        if event.sym in _MODIFIER_ONLY_KEYS:
+            return None
+        return self.on_exit()
+
+    def ev_mousebuttondown(self, event: tcod.event.MouseButtonDown) -> Optional[ActionOrHandler]:
+        return self.on_exit()
+
+    def on_exit(self) -> Optional[ActionOrHandler]:
+        return _get_main_handler(self.engine)
+
+
+class SelectIndexHandler(AskUserEventHandler):
+    __slots__ = ("_last_rendered",)
+
+    def __init__(self, engine: Engine):
+        """Sets the cursor to the player when this handler is constructed."""
+        super().__init__(engine)
+        player = self.engine.player
+        engine.mouse_location = player.x, player.y
+        self._last_rendered: Optional[Tuple[int, int]] = None
+
+    def tick(self, events: Iterable[tcod.event.Event]) -> Tuple[BaseEventHandler, bool]:
+        """Skip the redraw while the targeting cursor sits still.
+
+        Redraw only when the cursor differs from the position last drawn to
+        the screen, rather than from wherever it was at the start of the
+        batch — the root console is cleared every frame, so the skip has to
+        happen here instead of inside on_render.
+        """
+        engine = self.engine
+        handler = self.handle_events_batch(events)
+        needs_render = (handler is not self
+                        or engine.dirty
+                        or engine.mouse_location != self._last_rendered)
+        engine.dirty = False
+        return handler, needs_render
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        """Highlight the tile under the cursor."""
+        super().on_render(console)
+        x, y = self.engine.mouse_location
+        # Index the console buffer once and write both colors through the
+        # record view, rather than paying a structured-field lookup per channel.
+        cell = console.rgb[x, y]
+        cell["bg"] = color.white
+        cell["fg"] = color.black
+        self._last_rendered = (x, y)
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
+        """Check for key movement or confirmation keys."""
+        key = event.sym
+        sym = int(key)
+        if sym & _SCANCODE_MASK:
+            sym = (sym & 0x1FF) | 0x200
+        move = _MOVE_TABLE[sym] if sym < _KEY_TABLE_SIZE else None
+        if move is not None:
+            modifier = _MOD_MULT[event.mod & 0xFFF]
+
+            gm = self.engine.game_map
+            w1 = gm.width - 1
+            h1 = gm.height - 1
+            x, y = self.engine.mouse_location
+            dx, dy = move
+            # Clamp the cursor to the map with inline ternaries instead of
+            # min/max builtin calls.
+            x = 0 if (nx := x + dx * modifier) < 0 else (w1 if nx > w1 else nx)
+            y = 0 if (ny := y + dy * modifier) < 0 else (h1 if ny > h1 else ny)
+            self.engine.mouse_location = x, y
+            return None
+        elif key in CONFIRM_KEYS:
+            return self.on_index_selected(*self.engine.mouse_location)
+        return super().ev_keydown(event)
+
+    def ev_mousebuttondown(self, event: tcod.event.MouseButtonDown) -> Optional[ActionOrHandler]:
+        """Left click confirms a selection."""
+        if self.engine.game_map.in_bounds(*event.tile):
+            if event.button == 1:
+                return self.on_index_selected(*event.tile)
+        return super().ev_mousebuttondown(event)
+
+    def on_index_selected(self, x: int, y: int) -> Optional[ActionOrHandler]:
+        raise NotImplementedError()
+
+
+class LookHandler(SelectIndexHandler):
+    __slots__ = ()
+
+    def on_index_selected(self, x: int, y: int) -> MainGameEventHandler:
+        return _get_main_handler(self.engine)
+
+
+class GameOverEventHandler(EventHandler):
+    __slots__ = ()
+
+    def on_quit(self) -> None:
+        if os.path.exists("savegame.sav"):
+            os.remove("savegame.sav")
+        raise exceptions.QuitWithoutSaving()
+
+    def ev_quit(self, event: tcod.event.Quit) -> None:
+        self.on_quit()
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> None:
+        if event.sym == tcod.event.KeySym.ESCAPE:
+            self.on_quit()
+
+
+def _raise_system_exit(handler: MainGameEventHandler, event: tcod.event.KeyDown) -> None:
+    raise SystemExit()
+
+
+def _wait_or_take_stairs(handler: MainGameEventHandler, event: tcod.event.KeyDown) -> Action:
+    # PERIOD doubles as ">" (take stairs) when shift is held.
+    if event.mod & (tcod.event.KMOD_LSHIFT | tcod.event.KMOD_RSHIFT):
+        return _TakeStairsAction(handler.engine.player)
+    return WaitAction(handler.engine.player)
+
+
+def _open_history_viewer(handler: MainGameEventHandler, event: tcod.event.KeyDown):
+    from input_handlers.menus import HistoryViewer
+    return HistoryViewer(handler.engine)
+
+
+def _open_inventory_activate(handler: MainGameEventHandler, event: tcod.event.KeyDown):
+    from input_handlers.menus import InventoryActivateHandler
+    return InventoryActivateHandler(handler.engine)
+
+
+def _open_inventory_drop(handler: MainGameEventHandler, event: tcod.event.KeyDown):
+    from input_handlers.menus import InventoryDropHandler
+    return InventoryDropHandler(handler.engine)
+
+
+def _open_character_screen(handler: MainGameEventHandler, event: tcod.event.KeyDown):
+    from input_handlers.menus import CharacterScreenEventHandler
+    return CharacterScreenEventHandler(handler.engine)
+
+
+# Single dict lookup covering every main-game key binding — movement, wait
+# and the special keys — replacing the former membership tests and if/elif
+# chain in MainGameEventHandler.ev_keydown.  Built once at import; entries
+# that open menu screens import the menus submodule on first use.
+_MAIN_KEY_DISPATCH: dict = {
+    tcod.event.KeySym.ESCAPE: _raise_system_exit,
+    tcod.event.KeySym.v: _open_history_viewer,
+    tcod.event.KeySym.g: lambda handler, event: PickupAction(handler.engine.player),
+    tcod.event.KeySym.i: _open_inventory_activate,
+    tcod.event.KeySym.d: _open_inventory_drop,
+    tcod.event.KeySym.c: _open_character_screen,
+    tcod.event.KeySym.SLASH: lambda handler, event: LookHandler(handler.engine),
+}
+
+for _key, (_dx, _dy) in MOVE_KEYS.items():
+    _MAIN_KEY_DISPATCH[_key] = (
+        lambda handler, event, dx=_dx, dy=_dy: BumpAction(handler.engine.player, dx, dy)
+    )
+
+for _key in WAIT_KEYS:
+    _MAIN_KEY_DISPATCH[_key] = lambda handler, event: WaitAction(handler.engine.player)
+
+_MAIN_KEY_DISPATCH[tcod.event.KeySym.PERIOD] = _wait_or_take_stairs
+
+
+_LAZY_MENU_NAMES = frozenset({
+    "CURSOR_Y_KEYS",
+    "HistoryViewer",
+    "InventoryEventHandler",
+    "InventoryActivateHandler",
+    "InventoryDropHandler",
+    "CharacterScreenEventHandler",
+    "LevelUpEventHandler",
+    "SingleRangedAttackHandler",
+    "AreaRangedAttackHandler",
+})
+
+
+def __getattr__(name: str):
+    """Load the menu and targeting handlers on first use (PEP 562).
+
+    They live in input_handlers.menus, which is only parsed when one of
+    them is actually needed, keeping game startup to the core handlers.
+    """
+    if name in _LAZY_MENU_NAMES:
+        from input_handlers import menus
+        return getattr(menus, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
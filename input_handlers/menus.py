@@ -0,0 +1,361 @@
+"""Menu and targeting screens, loaded lazily by the input_handlers package.
+
+These handlers are only active while a menu is open, so the core package
+module defers importing this one until the first menu key is pressed.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple, TYPE_CHECKING
+import tcod
+from tcod import libtcodpy
+
+import actions
+from actions import Action
+import color
+from input_handlers import (
+    ActionOrHandler,
+    AskUserEventHandler,
+    EventHandler,
+    MainGameEventHandler,
+    SelectIndexHandler,
+    _build_key_table,
+    _get_main_handler,
+    _ITEM_KEYS,
+    _KEY_TABLE_SIZE,
+    _SCANCODE_MASK,
+)
+
+# Pre-bound action factories, matching the aliasing in the package module.
+_EquipAction = actions.EquipAction
+_DropItem = actions.DropItem
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from entity import Item
+
+
+class CharacterScreenEventHandler(AskUserEventHandler):
+    __slots__ = ()
+
+    TITLE = "Character Information"
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        super().on_render(console)
+
+        player = self.engine.player
+        level = player.level
+        fighter = player.fighter
+        print_ = console.print
+
+        if player.x <= 30:
+            x = 40
+        else:
+            x = 0
+
+        y = 0
+
+        width = len(self.TITLE) + 4
+
+        console.draw_frame(x=x,
+                           y=y,
+                           width=width,
+                           height=7,
+                           title=self.TITLE,
+                           clear=True,
+                           fg=(255, 255, 255),
+                           bg=(0, 0, 0))
+
+        print_(x=x + 1, y=y + 1, string=f"Level: {level.current_level}")
+        print_(x=x + 1, y=y + 2, string=f"XP: {level.current_xp}")
+        print_(x=x + 1, y=y + 3,
+               string=f"XP for next Level: {level.experience_to_next_level}")
+
+        print_(x=x + 1, y=y + 4, string=f"Attack: {fighter.power}")
+        print_(x=x + 1, y=y + 5, string=f"Defense: {fighter.defense}")
+
+
+class LevelUpEventHandler(AskUserEventHandler):
+    __slots__ = ("_upgrades",)
+
+    TITLE = "Level Up"
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        # The a/b/c choices, indexable by selection so ev_keydown needs no
+        # branching between them.
+        level = engine.player.level
+        self._upgrades = (level.increase_max_hp,
+                          level.increase_power,
+                          level.increase_defense)
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        super().on_render(console)
+
+        player = self.engine.player
+        fighter = player.fighter
+        print_ = console.print
+
+        if player.x <= 30:
+            x = 40
+        else:
+            x = 0
+
+        console.draw_frame(x=x,
+                           y=0,
+                           width=35,
+                           height=8,
+                           title=self.TITLE,
+                           clear=True,
+                           fg=(255, 255, 255),
+                           bg=(0, 0, 0))
+        print_(x=x + 1, y=1, string="Congratulations. You level up.")
+        print_(x=x + 1, y=2, string="Select an attribute to increase.")
+
+        print_(x=x + 1, y=4, string=f"a) Constitution (+20 HP, from {fighter.max_hp})")
+        print_(x=x + 1, y=5, string=f"b) Strength (+1 attack, from {fighter.power})")
+        print_(x=x + 1, y=6, string=f"c) Agility (+1 defense, from {fighter.defense})")
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
+        key = event.sym
+        index = key - tcod.event.KeySym.a
+
+        if 0 <= index <= 2:
+            self._upgrades[index]()
+        else:
+            self.engine.message_log.add_message("Invalid entry.", color.invalid)
+            self.engine.dirty = True
+
+            return None
+
+        return super().ev_keydown(event)
+
+    def ev_mousebuttondown(self, event: tcod.event.MouseButtonDown) -> Optional[ActionOrHandler]:
+        """
+        Don't allow the player to click to exit the menu like normal.
+        """
+        return None
+
+
+class InventoryEventHandler(AskUserEventHandler):
+    __slots__ = ()
+
+    TITLE = "<missing title>"
+    TITLE_WIDTH = len(TITLE) + 4
+
+    def __init_subclass__(cls, **kwargs):
+        """Compute the frame width from each subclass's TITLE once, at class
+        creation, instead of per rendered frame."""
+        super().__init_subclass__(**kwargs)
+        cls.TITLE_WIDTH = len(cls.TITLE) + 4
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        super().on_render(console)
+        player = self.engine.player
+        items = player.inventory.items
+        number_of_items_in_inventory = len(items)
+
+        height = number_of_items_in_inventory + 2
+
+        if height <= 3:
+            height = 3
+
+        if player.x <= 30:
+            x = 40
+        else:
+            x = 0
+
+        y = 0
+
+        console.draw_frame(x=x,
+                           y=y,
+                           width=self.TITLE_WIDTH,
+                           height=height,
+                           title=self.TITLE,
+                           clear=True,
+                           fg=(255, 255, 255),
+                           bg=(0, 0, 0)
+                           )
+        if number_of_items_in_inventory > 0:
+            # Bind the hot lookups once instead of re-chaining attribute
+            # accesses on every item.
+            is_equipped = player.equipment.item_is_equipped
+            print_ = console.print
+            base_x = x + 1
+            base_y = y + 1
+            for i, item in enumerate(items):
+                item_key = _ITEM_KEYS[i]
+
+                item_string = f"({item_key}) {item.name}"
+
+                if is_equipped(item):
+                    item_string = f"{item_string} (E)"
+
+                print_(base_x, base_y + i, item_string)
+        else:
+            console.print(x + 1, y + 1, "(Empty)")
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
+        player = self.engine.player
+        key = event.sym
+        index = key - tcod.event.KeySym.a
+
+        if 0 <= index <= 26:
+            items = player.inventory.items
+            if index < len(items):
+                return self.on_item_selected(items[index])
+            self.engine.message_log.add_message("Invalid entry.", color.invalid)
+            self.engine.dirty = True
+            return None
+        return super().ev_keydown(event)
+
+    def on_item_selected(self, item: Item) -> Optional[ActionOrHandler]:
+        if item.consumable:
+            return item.consumable.get_action(self.engine.player)
+        elif item.equippable:
+            return _EquipAction(self.engine.player, item)
+        else:
+            return None
+
+
+class InventoryActivateHandler(InventoryEventHandler):
+    __slots__ = ()
+
+    TITLE = "Select an item to use"
+
+    def on_item_selected(self, item: Item) -> Optional[ActionOrHandler]:
+        return item.consumable.get_action(self.engine.player)
+
+
+class InventoryDropHandler(InventoryEventHandler):
+    __slots__ = ()
+
+    TITLE = "Select an item to drop"
+
+    def on_item_selected(self, item: Item) -> Optional[ActionOrHandler]:
+        return _DropItem(self.engine.player, item)
+
+
+class SingleRangedAttackHandler(SelectIndexHandler):
+    __slots__ = ("callback",)
+
+    def __init__(self,
+                 engine: Engine,
+                 callback: Callable[[Tuple[int, int]], Optional[Action]],
+                 ):
+        super().__init__(engine)
+        self.callback = callback
+
+    def on_index_selected(self, x: int, y: int) -> Optional[Action]:
+        return self.callback((x, y))
+
+
+class AreaRangedAttackHandler(SelectIndexHandler):
+    __slots__ = ("radius", "callback")
+
+    def __init__(self,
+                 engine: Engine,
+                 radius: int,
+                 callback: Callable[[Tuple[int, int]], Optional[Action]]
+                 ):
+        super().__init__(engine)
+        self.radius = radius
+        self.callback = callback
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        super().on_render(console)
+        x, y = self.engine.mouse_location
+
+        # The frame encloses the affected area: the radius on each side of
+        # the cursor plus the cursor tile itself.
+        r = self.radius
+        size = r + r + 1
+        console.draw_frame(x=x - r - 1,
+                           y=y - r - 1,
+                           width=size,
+                           height=size,
+                           fg=color.red,
+                           clear=False,
+                           )
+
+    def on_index_selected(self, x: int, y: int) -> Optional[Action]:
+        return self.callback((x, y))
+
+
+CURSOR_Y_KEYS = {
+    tcod.event.KeySym.UP: -1,
+    tcod.event.KeySym.DOWN: 1,
+    tcod.event.KeySym.PAGEUP: -10,
+    tcod.event.KeySym.PAGEDOWN: 10,
+}
+
+_CURSOR_Y_TABLE = _build_key_table(CURSOR_Y_KEYS)
+
+
+class HistoryViewer(EventHandler):
+    __slots__ = ("log_length", "cursor")
+
+    # The rendered log console is cached at class level, keyed by size, so it
+    # survives across HistoryViewer instances and is only redrawn when the
+    # cursor or the log itself changes — re-wrapping every message line each
+    # frame is the expensive part of this screen.
+    _console_cache: dict = {}
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        self.log_length = len(engine.message_log.messages)
+        self.cursor = self.log_length - 1
+
+    def on_render(self, console: tcod.console.Console) -> None:
+        super().on_render(console)  # Draw the main state as the background.
+
+        message_log = self.engine.message_log
+        messages = message_log.messages
+        size = (console.width - 6, console.height - 6)
+        # The last message's count is part of the tag: add_message stacks a
+        # repeated message into messages[-1].count without growing the list.
+        cache_key = (self.cursor,
+                     len(messages),
+                     messages[-1].count if messages else 0,
+                     id(message_log))
+
+        cached_key, log_console = self._console_cache.get(size, (None, None))
+        if log_console is None:
+            log_console = tcod.console.Console(*size)
+        if cache_key != cached_key:
+            log_console.clear()
+            log_console.draw_frame(0, 0, log_console.width, log_console.height)
+            log_console.print_box(0, 0, log_console.width, 1, "┤Message history├", alignment=libtcodpy.CENTER)
+
+            message_log.render_messages(
+                log_console,
+                1,
+                1,
+                log_console.width - 2,
+                log_console.height - 2,
+                message_log.messages[: self.cursor + 1],
+            )
+            self._console_cache[size] = (cache_key, log_console)
+        log_console.blit(console, 3, 3)
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[MainGameEventHandler]:
+        sym = int(event.sym)
+        if sym & _SCANCODE_MASK:
+            sym = (sym & 0x1FF) | 0x200
+        adjust = _CURSOR_Y_TABLE[sym] if sym < _KEY_TABLE_SIZE else None
+        if adjust is not None:
+            if adjust < 0 and self.cursor == 0:
+                self.cursor = self.log_length - 1
+            elif adjust > 0 and self.cursor == self.log_length - 1:
+                self.cursor = 0
+            else:
+                self.cursor = max(0, min(self.cursor + adjust, self.log_length - 1))
+        elif event.sym == tcod.event.KeySym.HOME:
+            self.cursor = 0
+        elif event.sym == tcod.event.KeySym.END:
+            self.cursor = self.log_length - 1
+        else:
+            return _get_main_handler(self.engine)
+        # Scrolling changes no engine state, so flag the redraw ourselves or
+        # tick() will skip the frame and the window appears frozen.
+        self.engine.dirty = True
+        return None
@@ -35,14 +35,21 @@ def main() -> None:
                 handler.on_render(console=root_console)
                 context.present(root_console)
 
-                try:
-                    for event in tcod.event.wait():
-                        context.convert_event(event)
-                        handler = handler.handle_events(event)
-                except Exception:
-                    traceback.print_exc()
-                    if isinstance(handler, input_handlers.EventHandler):
-                        handler.engine.message_log.add_message(traceback.format_exc(), color.error)
+                # Poll and handle events until a frame actually needs redrawing,
+                # skipping redundant redraws on idle frames.
+                needs_render = False
+                while not needs_render:
+                    try:
+                        events = []
+                        for event in tcod.event.wait():
+                            context.convert_event(event)
+                            events.append(event)
+                        handler, needs_render = handler.tick(events)
+                    except Exception:
+                        traceback.print_exc()
+                        if isinstance(handler, input_handlers.EventHandler):
+                            handler.engine.message_log.add_message(traceback.format_exc(), color.error)
+                        needs_render = True
         except exceptions.QuitWithoutSaving:
             raise
         except SystemExit: